@@ -32,7 +32,7 @@ class BackupMetadata:
 class StateBackup:
     """Manages state backups and restoration."""
 
-    def _generate_backup_id(self) -> str:
+    def _generate_backup_id(self, now: datetime | None = None) -> str:
         """
         Generate unique backup ID with collision resistance.
 
@@ -40,13 +40,16 @@ class StateBackup:
         UUID4 provides ~5.3×10^36 possible values, making collisions
         virtually impossible. No artificial delays needed.
 
+        Args:
+            now: Time used for the timestamp part. Defaults to the current time
+
         Returns:
             Unique backup ID string (format: YYYYMMDD-HHMMSS_{uuid4})
         """
         # UUID4 for guaranteed uniqueness (NOT dependent on timestamp)
         unique_id = uuid.uuid4()
         # Timestamp only for ordering/sorting, NOT for uniqueness
-        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        timestamp = (now or datetime.now()).strftime('%Y%m%d-%H%M%S')
         return f"{timestamp}_{unique_id}"
 
     def __init__(self, backup_dir: Path | None = None):
@@ -74,25 +77,72 @@ class StateBackup:
         Returns:
             Backup metadata
         """
-        backup_id = self._generate_backup_id()
+        return self.create_backups_batch([files], [reason])[0]
+
+    def create_backups_batch(
+        self,
+        groups: list[list[Path]],
+        reasons: list[str]
+    ) -> list[BackupMetadata]:
+        """
+        Create one backup per group of files in a single call.
+
+        Each group still gets its own backup directory and metadata.json, so
+        restore_backup, list_backups and cleanup_old_backups handle them
+        exactly like create_backup results. The clock is read once for the
+        whole batch, and missing files are skipped by catching the copy
+        error instead of a separate exists() stat per file.
+
+        Args:
+            groups: File lists, one per backup
+            reasons: Reason for each backup, parallel to groups
+
+        Returns:
+            Backup metadata for each group, in order
+
+        Raises:
+            ValueError: If groups and reasons differ in length
+        """
+        if len(groups) != len(reasons):
+            raise ValueError(
+                f"groups and reasons must have the same length "
+                f"({len(groups)} != {len(reasons)})"
+            )
+
+        now = datetime.now()
+        timestamp = now.isoformat()
+
+        return [
+            self._write_backup(self._generate_backup_id(now), files, reason, timestamp)
+            for files, reason in zip(groups, reasons)
+        ]
+
+    def _write_backup(
+        self,
+        backup_id: str,
+        files: list[Path],
+        reason: str,
+        timestamp: str
+    ) -> BackupMetadata:
+        """Copy files into a new backup directory and write its metadata."""
         backup_path = self.backup_dir / backup_id
         backup_path.mkdir(exist_ok=True)
 
         backed_up = []
 
         for file_path in files:
-            if not file_path.exists():
-                continue
-
             # Create relative path structure in backup
             rel_path = file_path.name
             dest = backup_path / rel_path
 
-            shutil.copy2(file_path, dest)
+            try:
+                shutil.copy2(file_path, dest)
+            except FileNotFoundError:
+                continue
             backed_up.append(str(file_path))
 
         metadata = BackupMetadata(
-            timestamp=datetime.now().isoformat(),
+            timestamp=timestamp,
             backup_id=backup_id,
             files_backed_up=backed_up,
             reason=reason,
@@ -7,6 +7,7 @@ error handling without exceptions.
 Pattern from: Functional programming principles + Skills-Fabrik patterns.
 """
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TypeVar, Generic, Callable, Any
@@ -23,6 +24,10 @@ from logger import get_logger, LogLevel
 
 logger = get_logger(__name__)
 
+# Direct reference to the process environment mapping (avoids a global
+# attribute lookup on every get_optional_env call)
+_env = os.environ
+
 # Type aliases for readability
 T = TypeVar('T')
 E = TypeVar('E')
@@ -250,14 +255,13 @@ def get_optional_env(key: str) -> Maybe[str]:
     """
     Get optional environment variable.
 
-    Returns Some[str] if set, Nothing if not set.
+    Returns Some[str] if set, Nothing if not set or empty.
 
     Example:
         >>> api_key = get_optional_env("API_KEY")
         >>> print(api_key.unwrap_or("default"))
     """
-    import os
-    value = os.environ.get(key)
+    value = _env.get(key)
     return Some(value) if value else Nothing
 
 
@@ -267,7 +271,7 @@ def get_optional_env(key: str) -> Maybe[str]:
 
 def parse_and_validate_config(
     config_path: Path,
-    required_keys: list[str]
+    required_keys: list[str] | frozenset[str]
 ) -> Result[dict[str, Any], ConfigError | ValidationError]:
     """
     Parse and validate config in a functional pipeline.
@@ -276,7 +280,8 @@ def parse_and_validate_config(
 
     Args:
         config_path: Path to config file
-        required_keys: Keys that must be present in config
+        required_keys: Keys that must be present in config. A prebuilt
+            frozenset is used as-is.
 
     Returns:
         Success[dict] if config valid
@@ -288,13 +293,16 @@ def parse_and_validate_config(
         ...     ["gates", "version"]
         ... )
     """
+    # frozenset() returns a frozenset argument unchanged, so prebuilt sets are free
+    required = frozenset(required_keys)
+
     def validate_keys(config: dict[str, Any]) -> Result[dict[str, Any], ValidationError]:
         """Validate required keys exist in config."""
-        missing_keys = [k for k in required_keys if k not in config]
+        missing_keys = required.difference(config)
         if missing_keys:
             return Failure(ValidationError(
                 check_name="required_keys",
-                reason=f"Missing keys: {', '.join(missing_keys)}"
+                reason=f"Missing keys: {', '.join(sorted(missing_keys))}"
             ))
         return Success(config)
 
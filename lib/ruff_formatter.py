@@ -10,24 +10,45 @@ Provides a unified interface for formatting and linting Python files.
 """
 import subprocess
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Literal
+from enum import IntEnum
+from typing import Literal, NamedTuple
 
 
-@dataclass(frozen=True)
-class RuffResult:
-    """Resultado de ejecución ruff."""
+# Fixed error messages, stored verbatim in RuffResult.output
+RUFF_NOT_FOUND_MESSAGE = "ruff not found. Install with: pip install ruff"
+
+
+class RuffFailureKind(IntEnum):
+    """Motivo de fallo de una ejecución ruff, para chequeos sin parsear output."""
+    NONE = 0
+    TIMEOUT = 1
+    NOT_FOUND = 2
+    ERROR = 3
+
+
+class RuffResult(NamedTuple):
+    """Resultado de ejecución ruff (tupla inmutable, barata de crear)."""
     success: bool
     formatted: bool
     lint_errors: int
     lint_fixed: int
     output: str
     exit_code: int
+    failure_kind: RuffFailureKind = RuffFailureKind.NONE
 
 
 class RuffFormatter:
     """Wrapper para ruff format + check."""
 
+    __slots__ = (
+        'config_path',
+        'target_version',
+        'config_args',
+        '_format_argv_prefix',
+        '_check_argv_prefix',
+        '_check_nofix_argv_prefix',
+    )
+
     def __init__(self, config_path: Path | None = None, target_version: str = "py314"):
         """
         Initialize Ruff formatter.
@@ -40,6 +61,11 @@ class RuffFormatter:
         self.target_version = target_version
         self.config_args = [f"--config={config_path}"] if config_path else []
 
+        # argv prefixes built once; per-call commands only append the target
+        self._format_argv_prefix: tuple[str, ...] = ("ruff", "format", *self.config_args)
+        self._check_argv_prefix: tuple[str, ...] = ("ruff", "check", "--fix", *self.config_args)
+        self._check_nofix_argv_prefix: tuple[str, ...] = ("ruff", "check", *self.config_args)
+
     def _handle_subprocess_error(self, error: Exception, operation: str) -> RuffResult:
         """
         Handle subprocess errors consistently.
@@ -59,7 +85,8 @@ class RuffFormatter:
                 lint_errors=0,
                 lint_fixed=0,
                 output=f"{operation} timed out after {timeout} seconds",
-                exit_code=-1
+                exit_code=-1,
+                failure_kind=RuffFailureKind.TIMEOUT
             )
         elif isinstance(error, FileNotFoundError):
             return RuffResult(
@@ -67,8 +94,9 @@ class RuffFormatter:
                 formatted=False,
                 lint_errors=0,
                 lint_fixed=0,
-                output="ruff not found. Install with: pip install ruff",
-                exit_code=-2
+                output=RUFF_NOT_FOUND_MESSAGE,
+                exit_code=-2,
+                failure_kind=RuffFailureKind.NOT_FOUND
             )
         else:
             return RuffResult(
@@ -77,7 +105,8 @@ class RuffFormatter:
                 lint_errors=0,
                 lint_fixed=0,
                 output=f"Unexpected error: {type(error).__name__}",
-                exit_code=-3
+                exit_code=-3,
+                failure_kind=RuffFailureKind.ERROR
             )
 
     def format_file(self, file_path: Path) -> RuffResult:
@@ -90,11 +119,7 @@ class RuffFormatter:
         Returns:
             RuffResult with formatting outcome
         """
-        cmd = [
-            "ruff", "format",
-            *self.config_args,
-            str(file_path)
-        ]
+        cmd = (*self._format_argv_prefix, str(file_path))
 
         try:
             result = subprocess.run(
@@ -138,15 +163,8 @@ class RuffFormatter:
         Returns:
             RuffResult with lint findings
         """
-        target = [str(file_path)] if file_path else ["."]
-        fix_flag = ["--fix"] if fix else []
-
-        cmd = [
-            "ruff", "check",
-            *fix_flag,
-            *self.config_args,
-            *target
-        ]
+        prefix = self._check_argv_prefix if fix else self._check_nofix_argv_prefix
+        cmd = (*prefix, str(file_path) if file_path else ".")
 
         try:
             result = subprocess.run(
@@ -210,7 +228,8 @@ class RuffFormatter:
             lint_errors=check_result.lint_errors,
             lint_fixed=check_result.lint_fixed,
             output=combined_output,
-            exit_code=max(format_result.exit_code, check_result.exit_code)
+            exit_code=max(format_result.exit_code, check_result.exit_code),
+            failure_kind=format_result.failure_kind or check_result.failure_kind
         )
 
     def is_available(self) -> bool:
@@ -16,9 +16,12 @@ Types:
 - EXTERNAL: External context
 """
 
+from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
+import hashlib
 import re
 from typing import Literal, cast
 
@@ -34,9 +37,9 @@ class TagType(Enum):
     EXTERNAL = "EXTERNAL"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PromptTag:
-    """A single TAG annotation."""
+    """A single TAG annotation (immutable and hashable, no per-instance __dict__)."""
     type: Literal['K', 'C', 'U', 'EVIDENCIA', 'PROPUESTA', 'INTERNAL', 'EXTERNAL']
     category: str
     value: str
@@ -46,6 +49,162 @@ class PromptTag:
         return f"[{self.type}:{self.category}] {self.value}"
 
 
+# Translation table for the ASCII fast path of normalize(): A-Z -> a-z and
+# every ASCII whitespace character (as defined by str.isspace) -> space
+_ASCII_WHITESPACE = bytes(c for c in range(128) if chr(c).isspace())
+_ASCII_NORMALIZE_TABLE = bytes.maketrans(
+    bytes(range(ord('A'), ord('Z') + 1)) + _ASCII_WHITESPACE,
+    bytes(range(ord('a'), ord('z') + 1)) + b' ' * len(_ASCII_WHITESPACE),
+)
+
+
+def _ascii_normalize_bytes(s: str) -> bytes:
+    """normalize() for pure-ASCII input, as ASCII bytes: one C-level translate + split/join."""
+    buf = s.encode('ascii').translate(_ASCII_NORMALIZE_TABLE)
+    return b' '.join(buf.split())
+
+
+def _ascii_normalize(s: str) -> str:
+    """normalize() for pure-ASCII input."""
+    return _ascii_normalize_bytes(s).decode('ascii')
+
+
+def normalize(s: str) -> str:
+    """
+    Normalize TAG text for duplicate detection.
+
+    Lowercases, collapses whitespace runs to a single space and strips
+    leading/trailing whitespace.
+
+    Args:
+        s: Raw TAG text
+
+    Returns:
+        Normalized text
+    """
+    if s.isascii():
+        return _ascii_normalize(s)
+    # str.split() with no separator splits on the same whitespace set as \s,
+    # so one split/join collapses runs and strips both ends in a single pass
+    return ' '.join(s.lower().split())
+
+
+def content_hash(s: str) -> str:
+    """
+    Fingerprint TAG text for deduplication.
+
+    Texts that normalize to the same string get the same hash. Uses
+    BLAKE2b with a 128-bit digest: dedup only needs collision resistance,
+    not SHA-256's cryptographic margin, and BLAKE2b is faster on short input.
+
+    Args:
+        s: Raw TAG text
+
+    Returns:
+        32-character hex digest
+    """
+    # ASCII input is hashed straight from the normalized bytes, skipping the
+    # decode to str and re-encode that normalize() would add
+    if s.isascii():
+        data = _ascii_normalize_bytes(s)
+    else:
+        data = normalize(s).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# Unicode-aware: accented, Cyrillic, CJK, ... letters are word characters too
+_WORD_RE = re.compile(r'\w+')
+
+
+class NearDupTracker:
+    """
+    Detect near-duplicate TAG values.
+
+    Exact duplicates (same content_hash) are caught first; otherwise a value
+    is a duplicate when the Jaccard similarity of its word shingles (runs of
+    shingle_size consecutive normalized words) with an already-seen value
+    reaches the threshold. Punctuation and spacing differences do not count,
+    while a changed word (a negation, a version number) breaks every shingle
+    that contains it. Values shorter than shingle_size words form a single
+    shingle, so they only match the same word sequence; values with no word
+    characters at all (e.g. punctuation only) have no shingles and are
+    matched by content_hash alone.
+    """
+
+    def __init__(self, threshold: float = 0.85, shingle_size: int = 5):
+        """
+        Initialize tracker.
+
+        Args:
+            threshold: Minimum Jaccard similarity to treat values as duplicates
+            shingle_size: Number of consecutive words per shingle
+        """
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self._hashes: set[str] = set()
+        self._shingle_sets: list[frozenset[tuple[str, ...]]] = []
+
+    def _shingles(self, text: str) -> frozenset[tuple[str, ...]]:
+        """Word n-grams of the text's normalized words (empty if it has none)."""
+        words = tuple(_WORD_RE.findall(normalize(text)))
+        if not words:
+            return frozenset()
+        k = self.shingle_size
+        if len(words) <= k:
+            return frozenset((words,))
+        return frozenset(words[i:i + k] for i in range(len(words) - k + 1))
+
+    def is_dup(self, text: str) -> bool:
+        """
+        Check text against previously seen values, recording it if new.
+
+        Args:
+            text: TAG value
+
+        Returns:
+            True if text duplicates a value seen earlier
+        """
+        digest = content_hash(text)
+        if digest in self._hashes:
+            return True
+
+        shingles = self._shingles(text)
+        if shingles:
+            for seen in self._shingle_sets:
+                if len(shingles & seen) / len(shingles | seen) >= self.threshold:
+                    return True
+            self._shingle_sets.append(shingles)
+
+        self._hashes.add(digest)
+        return False
+
+
+# (section_name, ((pattern, tag_prefix), ...)) pairs: a hashable snapshot of
+# TagExtractor.PATTERNS, so edits to PATTERNS yield a new cache key
+_PatternsKey = tuple[tuple[str, tuple[tuple[str, str], ...]], ...]
+_CompiledSections = dict[str, list[tuple[re.Pattern[str], str]]]
+
+
+@lru_cache(maxsize=16)
+def _compile_patterns(patterns: _PatternsKey) -> _CompiledSections:
+    """
+    Compile a PATTERNS table once per distinct table.
+
+    Args:
+        patterns: Snapshot of a PATTERNS dict
+
+    Returns:
+        Section name -> [(compiled pattern, tag_prefix)]
+    """
+    return {
+        section_name: [
+            (re.compile(pattern, re.DOTALL | re.MULTILINE), tag_prefix)
+            for pattern, tag_prefix in section_patterns
+        ]
+        for section_name, section_patterns in patterns
+    }
+
+
 class TagExtractor:
     """Extract TAGs from context files."""
 
@@ -74,6 +233,16 @@ class TagExtractor:
         ],
     }
 
+    # Standard context files scanned by extract_all, in priority order
+    CONTEXT_FILES = (
+        "CLAUDE.md",
+        "identity.md",
+        "projects.md",
+        "relationships.md",
+        "preferences.md",
+        "rules.md",
+    )
+
     def __init__(self, context_dir: Path | None = None):
         """
         Initialize TAG extractor.
@@ -82,6 +251,31 @@ class TagExtractor:
             context_dir: Path to Claude context directory. Defaults to ~/.claude/.context
         """
         self.context_dir = context_dir or Path.home() / ".claude" / ".context"
+        self._cache_key: tuple[Path, _PatternsKey, tuple[tuple[int, int] | None, ...]] | None = None
+        self._cached_tags: list[PromptTag] = []
+
+    def _stat_key(self) -> tuple[tuple[int, int] | None, ...]:
+        """(mtime_ns, size) of each standard context file, None if missing."""
+        key: list[tuple[int, int] | None] = []
+        for filename in self.CONTEXT_FILES:
+            try:
+                st = (self.context_dir / filename).stat()
+            except OSError:
+                key.append(None)
+            else:
+                key.append((st.st_mtime_ns, st.st_size))
+        return tuple(key)
+
+    def _patterns_key(self) -> _PatternsKey:
+        """Hashable snapshot of self.PATTERNS (subclass/instance overrides included)."""
+        return tuple(
+            (section_name, tuple((pattern, tag_prefix) for pattern, tag_prefix in patterns))
+            for section_name, patterns in self.PATTERNS.items()
+        )
+
+    def _compiled_patterns(self) -> _CompiledSections:
+        """Compiled form of self.PATTERNS."""
+        return _compile_patterns(self._patterns_key())
 
     def extract_from_file(self, file_path: Path) -> list[PromptTag]:
         """Extract TAGs from a specific context file."""
@@ -94,9 +288,9 @@ class TagExtractor:
             content = file_path.read_text()
 
             # Try each pattern
-            for section_name, patterns in self.PATTERNS.items():
+            for section_name, patterns in self._compiled_patterns().items():
                 for pattern, tag_prefix in patterns:
-                    matches = re.findall(pattern, content, re.DOTALL | re.MULTILINE)
+                    matches = pattern.findall(content)
                     for match in matches:
                         # Clean up the matched content
                         value = match.strip()
@@ -129,25 +323,54 @@ class TagExtractor:
 
         return tags
 
+    def extract_from_file_by_category(self, file_path: Path) -> defaultdict[str, list[PromptTag]]:
+        """
+        Extract TAGs from a context file grouped by category.
+
+        Args:
+            file_path: Context file to read
+
+        Returns:
+            Category -> TAGs in file order. Categories without TAGs read as
+            an empty list.
+        """
+        by_category: defaultdict[str, list[PromptTag]] = defaultdict(list)
+        for tag in self.extract_from_file(file_path):
+            by_category[tag.category].append(tag)
+        return by_category
+
     def extract_all(self) -> list[PromptTag]:
-        """Extract TAGs from all context files."""
-        tags = []
-
-        # Standard context files to scan
-        context_files = [
-            "CLAUDE.md",
-            "identity.md",
-            "projects.md",
-            "relationships.md",
-            "preferences.md",
-            "rules.md",
-        ]
+        """
+        Extract TAGs from all context files.
 
-        for filename in context_files:
-            file_path = self.context_dir / filename
-            tags.extend(self.extract_from_file(file_path))
+        The same section often appears in more than one file (e.g. CLAUDE.md
+        and identity.md), sometimes with small edits; within a category only
+        the first of a set of near-duplicate TAGs is kept (see NearDupTracker).
 
-        return tags
+        The result is cached per extractor and reused while context_dir,
+        PATTERNS and the mtime and size of every standard context file are
+        unchanged, so repeated calls on a long-lived extractor cost one stat
+        per file. (The prompt hook builds a new TagInjector per process, so
+        it always does a full scan.)
+        """
+        key = (self.context_dir, self._patterns_key(), self._stat_key())
+        if key == self._cache_key:
+            return list(self._cached_tags)
+
+        tags: list[PromptTag] = []
+        trackers: dict[tuple[str, str], NearDupTracker] = {}
+
+        for filename in self.CONTEXT_FILES:
+            file_path = self.context_dir / filename
+            for tag in self.extract_from_file(file_path):
+                tracker = trackers.setdefault((tag.type, tag.category), NearDupTracker())
+                if tracker.is_dup(tag.value):
+                    continue
+                tags.append(tag)
+
+        self._cache_key = key
+        self._cached_tags = tags
+        return list(tags)
 
     def format_tags_for_prompt(self, tags: list[PromptTag]) -> str:
         """Format TAGs for injection into prompt."""
@@ -4,11 +4,68 @@ Shared Utility Functions
 Common utility functions used across modules.
 """
 
-from time import perf_counter
-from typing import Callable, TypeVar
+import heapq
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import chain
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Iterable, Iterator, Literal, TypeVar
 
 T = TypeVar('T')
 
+# Source file extensions reported by get_recent_files by default
+DEFAULT_SOURCE_EXTENSIONS = ('.py', '.ts', '.tsx', '.js', '.jsx', '.md')
+
+# Directories get_recent_files never descends into (VCS metadata, caches,
+# virtualenvs and installed dependencies). Names such as "dist" and "build"
+# are left out: they are pruned at any depth, and packages or source
+# subdirectories with those names must still be reported.
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".tox",
+    ".venv",
+    "venv",
+    "node_modules",
+})
+
+# Filesystems whose inode numbers follow on-disk inode table layout, where
+# get_recent_files(order='inode') can turn random stat reads sequential.
+# Memory-backed and virtual filesystems (tmpfs, proc, ...) gain nothing.
+_INODE_ORDER_FSTYPES = frozenset({"ext2", "ext3", "ext4", "xfs"})
+
+# st_dev -> filesystem type (None if unknown), filled by _inode_order_supported
+_DEV_FSTYPE_CACHE: dict[int, str | None] = {}
+
+_MOUNT_ESCAPE_RE = re.compile(r"\\([0-7]{3})")
+
+
+def _calibrate_clock_overhead_ns(samples: int = 1000) -> int:
+    """
+    Cost of one back-to-back perf_counter_ns() pair, in nanoseconds.
+
+    The minimum over many samples is the cost with no scheduler noise.
+    """
+    deltas = []
+    for _ in range(samples):
+        t0 = perf_counter_ns()
+        t1 = perf_counter_ns()
+        deltas.append(t1 - t0)
+    return min(deltas)
+
+
+# Measured once at import and subtracted from every measure_duration_ms result
+_CLOCK_OVERHEAD_NS = _calibrate_clock_overhead_ns()
+
 
 def estimate_tokens_for_size(size_bytes: int) -> int:
     """
@@ -26,18 +83,244 @@ def estimate_tokens_for_size(size_bytes: int) -> int:
     return max(30, size_bytes // 34)
 
 
-def measure_duration_ms(func: Callable[[], T]) -> tuple[T, int]:
+def measure_duration_ms(func: Callable[[], T]) -> tuple[T, float]:
     """
     Measure function duration in milliseconds.
 
+    Uses the monotonic nanosecond clock, so sub-millisecond calls report
+    a fractional duration instead of rounding down to 0. The cost of the
+    two clock reads themselves is subtracted (clamped at zero), so tiny
+    functions are not dominated by measurement overhead.
+
     Args:
         func: A callable that takes no arguments
 
     Returns:
         A tuple of (result, duration_ms)
     """
-    start = perf_counter()
+    start = perf_counter_ns()
     result = func()
-    end = perf_counter()
-    duration_ms = int((end - start) * 1000)
-    return result, duration_ms
+    elapsed_ns = perf_counter_ns() - start
+    return result, max(0, elapsed_ns - _CLOCK_OVERHEAD_NS) / 1_000_000
+
+
+def _mount_fs_type(path: str) -> str | None:
+    """
+    Filesystem type (e.g. "ext4") of the mount containing path, from
+    /proc/self/mounts. None when it cannot be determined.
+    """
+    real = os.path.realpath(path)
+    fs_type = None
+    best = -1
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # Spaces etc. in mount points are written as octal escapes
+                mount_point = _MOUNT_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), fields[1])
+                inside = real == mount_point or real.startswith(mount_point.rstrip("/") + "/")
+                # Later lines win for the same mount point (stacked mounts)
+                if inside and len(mount_point) >= best:
+                    best = len(mount_point)
+                    fs_type = fields[2]
+    except OSError:
+        return None
+    return fs_type
+
+
+def _inode_order_supported(path: str) -> bool:
+    """
+    Whether stat-ing in inode order can help for the filesystem holding path.
+
+    The filesystem type is cached per device (st_dev), so only the first
+    lookup on each mount parses /proc/self/mounts.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        dev = os.stat(path).st_dev
+    except OSError:
+        return False
+    try:
+        fs_type = _DEV_FSTYPE_CACHE[dev]
+    except KeyError:
+        fs_type = _DEV_FSTYPE_CACHE[dev] = _mount_fs_type(path)
+    return fs_type in _INODE_ORDER_FSTYPES
+
+
+def _scan_dir(
+    path: str,
+    extensions: frozenset[str],
+    exclude_dirs: frozenset[str],
+    cutoff: float,
+    inode_order: bool = False,
+) -> tuple[list[tuple[float, str]], list[str]]:
+    """
+    List one directory for the recent-file walk.
+
+    DirEntry answers is_dir()/is_file() from the directory listing, so
+    only files with a matching extension cost a stat call and no Path
+    object is built per entry. Symlinked directories are not followed and
+    an unreadable directory yields nothing, as with Path.rglob.
+
+    With inode_order, matching files are stat-ed in inode number order
+    (DirEntry.inode() comes free with the listing). On block filesystems
+    inode tables are laid out by number, so this turns random metadata
+    reads into mostly sequential ones when they are not cached.
+
+    Returns:
+        (mtime, path) of matching files modified after cutoff, and the
+        subdirectories to descend into (those not in exclude_dirs)
+    """
+    files: list[tuple[float, str]] = []
+    subdirs: list[str] = []
+    candidates: list[os.DirEntry[str]] = []
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return files, subdirs
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in exclude_dirs:
+                    subdirs.append(entry.path)
+                continue
+            # Same suffix as os.path.splitext (leading dots are part of
+            # the name, so ".py" has none) without building a tuple per entry
+            head, dot, ext = entry.name.rpartition('.')
+            if not dot or '.' + ext not in extensions or not head.strip('.'):
+                continue
+            if entry.is_file():
+                candidates.append(entry)
+
+    if inode_order:
+        candidates.sort(key=os.DirEntry.inode)
+    # The extension test comes first: it is free, while stat() is a
+    # syscall on POSIX
+    for entry in candidates:
+        try:
+            mtime = entry.stat().st_mtime
+        except OSError:
+            continue
+        if mtime > cutoff:
+            files.append((mtime, entry.path))
+    return files, subdirs
+
+
+def _walk_files(
+    dirs: list[str],
+    extensions: frozenset[str],
+    exclude_dirs: frozenset[str],
+    cutoff: float,
+    inode_order: bool = False,
+) -> Iterator[tuple[float, str]]:
+    """Yield _scan_dir matches for every directory under dirs (iterative, one thread)."""
+    stack = list(dirs)
+    while stack:
+        files, subdirs = _scan_dir(stack.pop(), extensions, exclude_dirs, cutoff, inode_order)
+        yield from files
+        stack.extend(subdirs)
+
+
+def _walk_files_parallel(
+    dirs: list[str],
+    extensions: frozenset[str],
+    exclude_dirs: frozenset[str],
+    cutoff: float,
+    inode_order: bool = False,
+) -> Iterator[tuple[float, str]]:
+    """
+    Yield _scan_dir matches for every directory under dirs using a thread pool.
+
+    Each directory is one task; scandir and stat release the GIL, so the
+    syscall latency of sibling directories overlaps. Only this generator
+    submits tasks and reads results, so no shared state needs locking.
+    """
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {
+            pool.submit(_scan_dir, d, extensions, exclude_dirs, cutoff, inode_order)
+            for d in dirs
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                yield from files
+                pending.update(
+                    pool.submit(_scan_dir, d, extensions, exclude_dirs, cutoff, inode_order)
+                    for d in subdirs
+                )
+
+
+def get_recent_files(
+    root: Path,
+    hours: float = 1.0,
+    extensions: Iterable[str] | None = None,
+    max_files: int | None = None,
+    exclude_dirs: Iterable[str] | None = None,
+    parallel: bool = False,
+    order: Literal['dentries', 'inode'] = 'dentries',
+) -> list[str]:
+    """
+    List source files under root modified within the last `hours`.
+
+    Args:
+        root: Directory to search
+        hours: How far back to look
+        extensions: File suffixes to include (with leading dot).
+            Defaults to DEFAULT_SOURCE_EXTENSIONS
+        max_files: Return at most this many files
+        exclude_dirs: Directory names to skip entirely, at any depth.
+            Defaults to DEFAULT_EXCLUDE_DIRS
+        parallel: Scan directories on a thread pool. Off by default: on a
+            warm cache the pool is slower than the serial walk. Setting
+            FABRIK_WALK_SERIAL=1 in the environment always forces a serial
+            walk (thread overhead can outweigh the gain on some
+            filesystems, e.g. APFS)
+        order: Order in which matching files of a directory are stat-ed.
+            'dentries' (default) keeps directory listing order, which is
+            best on SSDs and warm caches. 'inode' sorts by inode number
+            first, which helps cold scans on rotational disks; it is only
+            applied on Linux for block filesystems (see _INODE_ORDER_FSTYPES)
+
+    Returns:
+        Paths relative to root with '/' separators, most recently
+        modified first
+
+    Raises:
+        ValueError: If order is not 'dentries' or 'inode'
+    """
+    if order not in ('dentries', 'inode'):
+        raise ValueError(f"order must be 'dentries' or 'inode', got {order!r}")
+
+    exts = frozenset(extensions if extensions is not None else DEFAULT_SOURCE_EXTENSIONS)
+    excluded = frozenset(exclude_dirs) if exclude_dirs is not None else DEFAULT_EXCLUDE_DIRS
+    cutoff = time.time() - hours * 3600
+    root_str = str(root)
+
+    inode_order = order == 'inode' and _inode_order_supported(root_str)
+
+    root_files, subdirs = _scan_dir(root_str, exts, excluded, cutoff, inode_order)
+    if os.environ.get("FABRIK_WALK_SERIAL", "0") not in ("", "0"):
+        parallel = False
+    walk = _walk_files_parallel if parallel else _walk_files
+
+    candidates = chain(root_files, walk(subdirs, exts, excluded, cutoff, inode_order))
+    if max_files is None:
+        recent = sorted(candidates, reverse=True)
+    else:
+        # O(N log k) and only max_files entries kept in memory; (mtime, path)
+        # tuples compare mtime first, so this is newest first like sorted()
+        recent = heapq.nlargest(max_files, candidates)
+
+    # Every walked path is root_str joined with more components, so the
+    # relative path is a plain prefix strip (os.path.relpath would
+    # re-normalize both paths and call getcwd() for each survivor)
+    prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+    start = len(prefix)
+    if os.sep == '/':
+        return [path[start:] for _, path in recent]
+    return [path[start:].replace(os.sep, '/') for _, path in recent]
@@ -22,6 +22,7 @@ sys.path.insert(0, str(lib_dir))
 
 from handoff import HandoffProtocol
 from backup import StateBackup
+from utils import get_recent_files, DEFAULT_SOURCE_EXTENSIONS
 
 
 def create_handoff_from_context() -> dict[str, Any]:
@@ -61,17 +62,15 @@ def create_handoff_from_context() -> dict[str, Any]:
     if cwd != Path.home():
         # List recent files as potential artifacts
         try:
-            import time
-            cutoff = time.time() - 3600  # Last hour
-            recent_files = []
-            for f in cwd.rglob("*"):
-                if f.is_file() and f.stat().st_mtime > cutoff:
-                    # Only include source files
-                    if f.suffix in ['.py', '.ts', '.tsx', '.js', '.jsx', '.md', '.json']:
-                        recent_files.append(str(f.relative_to(cwd)))
+            recent_files = get_recent_files(
+                cwd,
+                hours=1,
+                extensions=(*DEFAULT_SOURCE_EXTENSIONS, '.json'),
+                max_files=20,
+            )
 
             if recent_files:
-                session_data['artifacts'] = recent_files[:20]  # Limit to 20
+                session_data['artifacts'] = recent_files
         except (OSError, PermissionError) as e:
             import logging
             logging.warning(f"Failed to discover recent files in {cwd}: {e}")
@@ -24,6 +24,7 @@ sys.path.insert(0, str(lib_dir))
 from quality_gates import QualityGateRunner, QualityGatesOrchestrator
 from alerts import QualityAlerts
 from fallback import create_fallback_manager, FallbackAction
+from utils import get_recent_files
 
 
 async def run_quality_gates(project_path: Path, changed_files: list[str], tier: str = "deep") -> tuple[list[Any], list[Any]]:
@@ -83,14 +84,8 @@ def main() -> int:
     # In real hook, changed_files would be in the input JSON
     changed_files = []
     try:
-        # Get files modified in last hour as approximation
-        import time
-        cutoff = time.time() - 3600
-        for f in project_path.rglob("*"):
-            if f.is_file() and f.stat().st_mtime > cutoff:
-                # Filter to source files
-                if f.suffix in ['.py', '.ts', '.tsx', '.js', '.jsx', '.md']:
-                    changed_files.append(str(f.relative_to(project_path)))
+        # Get source files modified in last hour as approximation
+        changed_files = get_recent_files(project_path, hours=1)
     except (OSError, PermissionError) as e:
         import logging
         logging.error(f"Failed to discover changed files in {project_path}: {e}")
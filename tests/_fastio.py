@@ -0,0 +1,44 @@
+"""
+Fast I/O helpers for test fixtures.
+
+Writes small fixture files through raw file descriptors, skipping the
+TextIOWrapper setup that Path.write_text performs on every call.
+"""
+
+import os
+from pathlib import Path
+
+
+def fwrite(p: Path, data: str) -> None:
+    """
+    Write UTF-8 text to a file using a raw file descriptor.
+
+    Args:
+        p: Destination path (created or truncated)
+        data: Text content to write
+    """
+    fd = os.open(p, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def touch_many(dir_str: str, names: list[str], content: bytes = b"") -> None:
+    """
+    Create (or truncate) several files in one directory.
+
+    Joins names onto a plain directory string, so no Path is built per file.
+
+    Args:
+        dir_str: Existing directory
+        names: File names to create inside dir_str
+        content: Bytes written to every file
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    for name in names:
+        fd = os.open(os.path.join(dir_str, name), flags, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
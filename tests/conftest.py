@@ -2,10 +2,18 @@
 Pytest configuration and shared fixtures for skills-fabrik-patterns tests.
 """
 
+import sys
+
 import pytest
 import tempfile
 from pathlib import Path
 
+# Make lib/ importable for every test module (done once per process, before
+# any test module is imported)
+lib_dir = Path(__file__).parent.parent / "lib"
+if str(lib_dir) not in sys.path:
+    sys.path.insert(0, str(lib_dir))
+
 
 @pytest.fixture
 def plugin_root() -> Path:
@@ -13,6 +21,19 @@ def plugin_root() -> Path:
     return Path(__file__).parent.parent.parent
 
 
+@pytest.fixture(scope="module")
+def default_formatter():
+    """
+    Shared RuffFormatter with default settings.
+
+    RuffFormatter holds no per-call state for a given config, so one
+    instance is reused across a test module. Tests that verify init
+    parameters should still construct their own.
+    """
+    from ruff_formatter import RuffFormatter
+    return RuffFormatter()
+
+
 @pytest.fixture
 def temp_dir(tmp_path: Path) -> Path:
     """
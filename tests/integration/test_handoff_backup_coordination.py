@@ -9,6 +9,7 @@ import pytest
 import tempfile
 import shutil
 import json
+import os
 from pathlib import Path
 import sys
 from datetime import datetime
@@ -166,13 +167,17 @@ class TestBackupCreation:
         for i in range(3):
             test_file = temp_dir / f"test-{i}.txt"
             test_file.write_text(f"content {i}")
-            backup_sys.create_backup([test_file], reason=f"backup-{i}")
+            metadata = backup_sys.create_backup([test_file], reason=f"backup-{i}")
+            # Distinct explicit mtimes: creation within one clock tick (or on
+            # coarse-mtime filesystems) would otherwise leave the order undefined
+            os.utime(backup_sys.backup_dir / metadata.backup_id, (1000 + i, 1000 + i))
 
         # List backups
         backups = backup_sys.list_backups(limit=10)
 
         assert len(backups) == 3
         assert all(isinstance(b, BackupMetadata) for b in backups)
+        assert [b.reason for b in backups] == ["backup-2", "backup-1", "backup-0"]
 
     def test_cleanup_old_backups(self, temp_dir: Path):
         """Test cleanup keeps only specified number of backups."""
@@ -8,16 +8,21 @@ Tests edge cases: empty files, malformed tags, XML tags, etc.
 import pytest
 import tempfile
 import shutil
+import os
 from pathlib import Path
-import sys
-
-# Ensure lib is in path
-lib_dir = Path(__file__).parent.parent.parent / "lib"
-if str(lib_dir) not in sys.path:
-    sys.path.insert(0, str(lib_dir))
 
 from tag_system import TagExtractor, TagInjector, PromptTag, TagType
 
+# Standard context files for extract_all tests, pre-encoded once at import
+_STANDARD_CONTEXT_FILES = (
+    ("CLAUDE.md", b"# Identity\nFelipe"),
+    ("identity.md", b"## Identity\nDeveloper"),
+    ("rules.md", b"## Rules\nUse FP"),
+    ("preferences.md", b"## Preferences\nVim"),
+    ("projects.md", b"## Projects\nPlugin"),
+    ("relationships.md", b"## Relationships\nTeam"),
+)
+
 
 class TestTagFormatValidation:
     """Test TAG format validation: [K:identity], [U:rules], [C:triggers]."""
@@ -117,113 +122,265 @@ class TestExtractTagsFromContext:
 
         assert tags == []
 
-    def test_extract_from_file_with_identity_section(self, temp_dir: Path):
-        """Test extracting Identity section generates K:identity tag.
+    # Identity-style patterns use ###? (minimum ##, single # does not match);
+    # Rules uses ##?
+    @pytest.mark.parametrize(
+        "content,tag_type,category,expected_text",
+        [
+            ("## Identity\n\nFelipe is a Python developer using FP patterns.\n",
+             'K', 'identity', "Felipe"),
+            ("### Projects\n\nskills-fabrik-patterns plugin\n",
+             'K', 'projects', "skills-fabrik"),
+            ("### Relationships\n\nWorks with the platform team\n",
+             'K', 'relationships', "platform team"),
+            ("## Rules\n\n- Always use immutable data structures\n- Follow PEP 8 conventions\n",
+             'U', 'rules', "immutable"),
+            ("### Preferences\n\nVim keybindings\n",
+             'U', 'preferences', "Vim"),
+            ("### Triggers\n\n- When creating new modules\n- Before committing code\n",
+             'C', 'triggers', "new modules"),
+            ("### Constraints\n\nNo network access in tests\n",
+             'C', 'constraints', "network"),
+        ],
+        ids=["identity", "projects", "relationships", "rules", "preferences", "triggers", "constraints"],
+    )
+    def test_extract_from_file_with_section(
+        self, temp_dir: Path, content: str, tag_type: str, category: str, expected_text: str
+    ):
+        """Test each known section generates exactly one TAG of its type and category."""
+        test_file = temp_dir / f"{category}.md"
+        test_file.write_text(content)
+
+        tags = TagExtractor(context_dir=temp_dir).extract_from_file(test_file)
 
-        Note: Identity pattern uses ###? which means minimum ## (double hash).
-        Single hash # does not match.
-        """
+        assert len(tags) == 1
+        assert tags[0].type == tag_type
+        assert tags[0].category == category
+        assert expected_text in tags[0].value
+
+    def test_extract_from_file_with_multiple_sections(self, temp_dir: Path):
+        """Test extracting file with multiple sections."""
         context_dir = temp_dir / ".context"
         context_dir.mkdir()
 
-        test_file = context_dir / "identity.md"
+        test_file = context_dir / "multi.md"
         test_file.write_text("""## Identity
 
-Felipe is a Python developer using FP patterns.
+Felipe is a developer.
+
+## Rules
+
+Use immutable data.
+
+## Triggers
+
+Before commits.
 """)
 
         extractor = TagExtractor(context_dir=context_dir)
+        by_category = extractor.extract_from_file_by_category(test_file)
+
+        assert by_category['identity'][0].value == "Felipe is a developer."
+        assert by_category['rules'][0].type == 'U'
+        assert by_category['triggers'][0].type == 'C'
+
+    def test_heading_word_without_heading_is_ignored(self, temp_dir: Path):
+        """Test section words in prose do not produce TAGs."""
+        test_file = temp_dir / "prose.md"
+        test_file.write_text("# Notes\nIdentity and Rules are covered elsewhere.\n")
+
+        extractor = TagExtractor(context_dir=temp_dir)
         tags = extractor.extract_from_file(test_file)
 
-        assert len(tags) == 1
-        assert tags[0].type == 'K'
-        assert tags[0].category == 'identity'
-        assert 'Felipe' in tags[0].value or 'Python' in tags[0].value
+        assert tags == []
+
+    def test_subclass_patterns_are_used(self, temp_dir: Path):
+        """Test a subclass overriding PATTERNS gets its own sections extracted."""
+        class GoalsExtractor(TagExtractor):
+            PATTERNS = {
+                **TagExtractor.PATTERNS,
+                "goals": [(r"###?\s*Goals & Aspirations\s*\n+(.*?)(?=###|\n\n|\Z)", "K:goals")],
+            }
+
+        test_file = temp_dir / "goals.md"
+        test_file.write_text("## Goals & Aspirations\nLearn FP")
+
+        assert GoalsExtractor(context_dir=temp_dir).extract_from_file(test_file) == [
+            PromptTag(type='K', category='goals', value="Learn FP")
+        ]
+        assert TagExtractor(context_dir=temp_dir).extract_from_file(test_file) == []
+
+    def test_heading_taken_from_pattern_not_section_name(self, temp_dir: Path):
+        """Test a section whose key differs from its heading still matches."""
+        class TechExtractor(TagExtractor):
+            PATTERNS = {
+                "tech_identity": [
+                    (r"###?\s*Technical Identity\s*\n+(.*?)(?=###|\n\n|\Z)", "K:tech_identity"),
+                ],
+            }
+
+        test_file = temp_dir / "tech.md"
+        test_file.write_text("## Technical Identity\nPython backend developer")
+
+        assert TechExtractor(context_dir=temp_dir).extract_from_file(test_file) == [
+            PromptTag(type='K', category='tech_identity', value="Python backend developer")
+        ]
+
+    def test_instance_patterns_are_used(self, temp_dir: Path):
+        """Test PATTERNS replaced on an instance is picked up."""
+        test_file = temp_dir / "goals.md"
+        test_file.write_text("## Goals\nLearn FP")
+
+        extractor = TagExtractor(context_dir=temp_dir)
+        extractor.PATTERNS = {"goals": [(r"###?\s*Goals\s*\n+(.*?)(?=###|\n\n|\Z)", "K:goals")]}
+
+        assert extractor.extract_from_file(test_file) == [
+            PromptTag(type='K', category='goals', value="Learn FP")
+        ]
 
-    def test_extract_from_file_with_rules_section(self, temp_dir: Path):
-        """Test extracting Rules section generates U:rules tag."""
+    def test_extract_all_scans_standard_files(self, temp_dir: Path):
+        """Test extract_all scans standard context files."""
         context_dir = temp_dir / ".context"
         context_dir.mkdir()
 
-        test_file = context_dir / "rules.md"
-        test_file.write_text("""## Rules
-
-- Always use immutable data structures
-- Follow PEP 8 conventions
-""")
+        # Create multiple context files
+        for name, data in _STANDARD_CONTEXT_FILES:
+            (context_dir / name).write_bytes(data)
 
         extractor = TagExtractor(context_dir=context_dir)
-        tags = extractor.extract_from_file(test_file)
+        tags = extractor.extract_all()
 
-        assert len(tags) == 1
-        assert tags[0].type == 'U'
-        assert tags[0].category == 'rules'
+        # Should extract from multiple files (single-hash CLAUDE.md heading does not match)
+        assert len(tags) > 0
+        assert {tag.category for tag in tags} == {
+            'identity', 'rules', 'preferences', 'projects', 'relationships'
+        }
 
-    def test_extract_from_file_with_triggers_section(self, temp_dir: Path):
-        """Test extracting Triggers section generates C:triggers tag."""
+    def test_extract_all_drops_duplicate_tags(self, temp_dir: Path):
+        """Test extract_all keeps one TAG per normalized value and category."""
         context_dir = temp_dir / ".context"
         context_dir.mkdir()
 
-        test_file = context_dir / "triggers.md"
-        test_file.write_text("""### Triggers
-
-- When creating new modules
-- Before committing code
-""")
+        (context_dir / "CLAUDE.md").write_text("## Identity\nFelipe  is a developer")
+        (context_dir / "identity.md").write_text("## Identity\nfelipe is a Developer")
+        (context_dir / "rules.md").write_text("## Rules\nFelipe is a developer")
 
         extractor = TagExtractor(context_dir=context_dir)
-        tags = extractor.extract_from_file(test_file)
+        tags = extractor.extract_all()
 
-        assert len(tags) == 1
-        assert tags[0].type == 'C'
-        assert tags[0].category == 'triggers'
+        identity_tags = [tag for tag in tags if tag.category == 'identity']
+        rules_tags = [tag for tag in tags if tag.category == 'rules']
+        assert len(identity_tags) == 1
+        assert identity_tags[0].value == "Felipe  is a developer"
+        assert len(rules_tags) == 1
 
-    def test_extract_from_file_with_multiple_sections(self, temp_dir: Path):
-        """Test extracting file with multiple sections."""
+    def test_extract_all_drops_paraphrased_tags(self, temp_dir: Path):
+        """Test extract_all collapses near-duplicate TAGs to the first one."""
         context_dir = temp_dir / ".context"
         context_dir.mkdir()
 
-        test_file = context_dir / "multi.md"
-        test_file.write_text("""## Identity
+        (context_dir / "CLAUDE.md").write_text(
+            "## Preferences\nPrefers immutable data structures and pure functions in all Python code"
+        )
+        (context_dir / "preferences.md").write_text(
+            "## Preferences\nPrefers immutable data structures and pure functions in all Python code, always"
+        )
 
-Felipe is a developer.
+        extractor = TagExtractor(context_dir=context_dir)
+        tags = extractor.extract_all()
 
-## Rules
+        preference_tags = [tag for tag in tags if tag.category == 'preferences']
+        assert len(preference_tags) == 1
+        assert preference_tags[0].value.endswith("in all Python code")
 
-Use immutable data.
+    def test_extract_all_keeps_negated_rule(self, temp_dir: Path):
+        """Test a rule and its negation both survive near-duplicate removal."""
+        (temp_dir / "CLAUDE.md").write_text(
+            "## Constraints\nDo not use mutable default arguments in any Python function definitions"
+        )
+        (temp_dir / "rules.md").write_text(
+            "## Constraints\nDo use mutable default arguments in any Python function definitions"
+        )
 
-## Triggers
+        tags = TagExtractor(context_dir=temp_dir).extract_all()
 
-Before commits.
-""")
+        assert [tag.value.split()[1] for tag in tags] == ["not", "use"]
 
-        extractor = TagExtractor(context_dir=context_dir)
-        tags = extractor.extract_from_file(test_file)
+    def test_extract_all_keeps_distinct_non_latin_tags(self, temp_dir: Path):
+        """Test values without ASCII letters are not collapsed into one TAG."""
+        (temp_dir / "CLAUDE.md").write_text("## Identity\nПрограммист")
+        (temp_dir / "identity.md").write_text("## Identity\nМедсестра в больнице")
 
-        assert len(tags) >= 3
-        categories = {tag.category for tag in tags}
-        assert 'identity' in categories
-        assert 'rules' in categories
-        assert 'triggers' in categories
+        tags = TagExtractor(context_dir=temp_dir).extract_all()
 
-    def test_extract_all_scans_standard_files(self, temp_dir: Path):
-        """Test extract_all scans standard context files."""
+        assert [tag.value for tag in tags] == ["Программист", "Медсестра в больнице"]
+
+    def test_extract_all_reuses_result_until_files_change(self, temp_dir: Path, monkeypatch):
+        """Test extract_all skips re-reading while context files are unchanged."""
         context_dir = temp_dir / ".context"
         context_dir.mkdir()
-
-        # Create multiple context files
-        (context_dir / "CLAUDE.md").write_text("# Identity\nFelipe")
-        (context_dir / "identity.md").write_text("## Identity\nDeveloper")
-        (context_dir / "rules.md").write_text("## Rules\nUse FP")
-        (context_dir / "preferences.md").write_text("## Preferences\nVim")
-        (context_dir / "projects.md").write_text("## Projects\nPlugin")
-        (context_dir / "relationships.md").write_text("## Relationships\nTeam")
+        claude_md = context_dir / "CLAUDE.md"
+        claude_md.write_text("## Identity\nDeveloper")
 
         extractor = TagExtractor(context_dir=context_dir)
+        first = extractor.extract_all()
+
+        reads: list[Path] = []
+        original = TagExtractor.extract_from_file
+        monkeypatch.setattr(
+            TagExtractor, "extract_from_file",
+            lambda self, path: reads.append(path) or original(self, path),
+        )
+
+        assert extractor.extract_all() == first
+        assert reads == []
+
+        claude_md.write_text("## Identity\nSenior developer")
+        st = claude_md.stat()
+        os.utime(claude_md, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
         tags = extractor.extract_all()
+        assert reads
+        assert [tag.value for tag in tags] == ["Senior developer"]
 
-        # Should extract from multiple files
-        assert len(tags) > 0
+
+    def test_extract_all_rescans_after_patterns_change(self, temp_dir: Path):
+        """Test replacing PATTERNS on the instance invalidates the cached result."""
+        (temp_dir / "CLAUDE.md").write_text("## Identity\nDeveloper\n\n## Goals\nLearn FP")
+
+        extractor = TagExtractor(context_dir=temp_dir)
+        assert [tag.category for tag in extractor.extract_all()] == ["identity"]
+
+        extractor.PATTERNS = {"goals": [(r"###?\s*Goals\s*\n+(.*?)(?=###|\n\n|\Z)", "K:goals")]}
+
+        assert [tag.category for tag in extractor.extract_all()] == ["goals"]
+
+    def test_extract_all_rescans_after_context_dir_change(self, temp_dir: Path):
+        """Test pointing the extractor at another directory invalidates the cached result."""
+        first_dir = temp_dir / "first"
+        second_dir = temp_dir / "second"
+        for context_dir, value in ((first_dir, "Developer"), (second_dir, "Architect")):
+            context_dir.mkdir()
+            (context_dir / "CLAUDE.md").write_text(f"## Identity\n{value}")
+        # Same mtime and size in both directories
+        st = (first_dir / "CLAUDE.md").stat()
+        os.utime(second_dir / "CLAUDE.md", ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        extractor = TagExtractor(context_dir=first_dir)
+        assert [tag.value for tag in extractor.extract_all()] == ["Developer"]
+
+        extractor.context_dir = second_dir
+
+        assert [tag.value for tag in extractor.extract_all()] == ["Architect"]
+
+
+@pytest.fixture(scope="class")
+def identity_context(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Context dir with one Identity section, shared by a class's read-only tests."""
+    context_dir = tmp_path_factory.mktemp("ctx") / ".context"
+    context_dir.mkdir()
+    (context_dir / "CLAUDE.md").write_text("## Identity\nFelipe")
+    return context_dir
 
 
 class TestTagInjection:
@@ -240,14 +397,9 @@ class TestTagInjection:
 
         assert result == original
 
-    def test_inject_prepends_tags_to_prompt(self, temp_dir: Path):
+    def test_inject_prepends_tags_to_prompt(self, identity_context: Path):
         """Test injection prepends TAGs block to prompt."""
-        context_dir = temp_dir / ".context"
-        context_dir.mkdir()
-
-        (context_dir / "CLAUDE.md").write_text("## Identity\nFelipe")
-
-        injector = TagInjector(extractor=TagExtractor(context_dir=context_dir))
+        injector = TagInjector(extractor=TagExtractor(context_dir=identity_context))
         original = "Help me with Python"
         result = injector.inject(original)
 
@@ -256,14 +408,9 @@ class TestTagInjection:
         assert result.endswith(original)
         assert result.index("## Context Tags") < result.index(original)
 
-    def test_inject_preserves_multi_line_prompt(self, temp_dir: Path):
+    def test_inject_preserves_multi_line_prompt(self, identity_context: Path):
         """Test injection preserves multi-line prompts."""
-        context_dir = temp_dir / ".context"
-        context_dir.mkdir()
-
-        (context_dir / "CLAUDE.md").write_text("## Identity\nFelipe")
-
-        injector = TagInjector(extractor=TagExtractor(context_dir=context_dir))
+        injector = TagInjector(extractor=TagExtractor(context_dir=identity_context))
         original = """Line 1
 Line 2
 Line 3"""
@@ -273,14 +420,9 @@ Line 3"""
         assert "Line 2" in result
         assert "Line 3" in result
 
-    def test_inject_with_empty_prompt(self, temp_dir: Path):
+    def test_inject_with_empty_prompt(self, identity_context: Path):
         """Test injection with empty prompt."""
-        context_dir = temp_dir / ".context"
-        context_dir.mkdir()
-
-        (context_dir / "CLAUDE.md").write_text("## Identity\nFelipe")
-
-        injector = TagInjector(extractor=TagExtractor(context_dir=context_dir))
+        injector = TagInjector(extractor=TagExtractor(context_dir=identity_context))
         result = injector.inject("")
 
         # Should have TAGs even with empty prompt
@@ -442,14 +584,13 @@ Triple hash - matches.
 """)
 
         extractor = TagExtractor(context_dir=context_dir)
-        tags = extractor.extract_from_file(test_file)
+        by_category = extractor.extract_from_file_by_category(test_file)
 
         # Should extract Rules (##) and Triggers (###), but not single-hash Identity
-        assert len(tags) == 2
-        categories = {tag.category for tag in tags}
-        assert 'rules' in categories
-        assert 'triggers' in categories
-        assert 'identity' not in categories  # Single hash doesn't match
+        assert sorted(by_category) == ['rules', 'triggers']
+        assert len(by_category['rules']) == 1
+        assert len(by_category['triggers']) == 1
+        assert by_category['identity'] == []  # Single hash doesn't match
 
     def test_empty_section_content(self, temp_dir: Path):
         """Test handling of sections with empty content."""
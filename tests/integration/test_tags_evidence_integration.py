@@ -21,6 +21,31 @@ from tag_system import TagExtractor, TagInjector, PromptTag, TagType
 from evidence_cli import EvidenceCLI, ProjectStructureCheck, DependencyCheck, ValidationStatus
 
 
+@pytest.fixture(scope="module")
+def temp_context_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Context directory shared by the read-only TAG tests in this module."""
+    context_dir = tmp_path_factory.mktemp("context")
+    (context_dir / "CLAUDE.md").write_text(
+        "# Identity\nPython developer\n\n"
+        "## Rules\nAlways write tests\n"
+    )
+    (context_dir / "projects.md").write_text("### Projects\nskills-fabrik-patterns\n")
+    return context_dir
+
+
+@pytest.fixture(scope="module")
+def extracted_tags(temp_context_dir: Path) -> tuple[TagExtractor, list[PromptTag]]:
+    """
+    One extractor and its extract_all() result for the whole module.
+
+    Extraction over a fixed context directory is deterministic, so tests
+    that only inspect the result share a single scan instead of each
+    re-reading every context file.
+    """
+    extractor = TagExtractor(context_dir=temp_context_dir)
+    return extractor, extractor.extract_all()
+
+
 class TestTagsExtraction:
     """Test TAG extraction from context files."""
 
@@ -36,10 +61,9 @@ class TestTagsExtraction:
         tag_types = {tag.type for tag in tags}
         assert 'K' in tag_types or 'U' in tag_types
 
-    def test_extract_all_context_files(self, temp_context_dir: Path):
+    def test_extract_all_context_files(self, extracted_tags):
         """Test extracting TAGs from all context files."""
-        extractor = TagExtractor(context_dir=temp_context_dir)
-        tags = extractor.extract_all()
+        _, tags = extracted_tags
 
         # Should have some TAGs
         assert isinstance(tags, list)
@@ -50,10 +74,9 @@ class TestTagsExtraction:
             assert hasattr(tag, 'category')
             assert hasattr(tag, 'value')
 
-    def test_format_tags_for_prompt(self, temp_context_dir: Path):
+    def test_format_tags_for_prompt(self, extracted_tags):
         """Test formatting TAGs for prompt injection."""
-        extractor = TagExtractor(context_dir=temp_context_dir)
-        tags = extractor.extract_all()
+        extractor, tags = extracted_tags
 
         formatted = extractor.format_tags_for_prompt(tags)
 
@@ -90,6 +113,7 @@ class TestTagsExtraction:
 class TestTagInjection:
     """Test TAG injection into prompts."""
 
+    @pytest.mark.xdist_group("home_dir")
     def test_inject_into_empty_prompt(self, temp_context_dir: Path):
         """Test injecting TAGs into empty prompt."""
         injector = TagInjector()
@@ -98,6 +122,7 @@ class TestTagInjection:
         # Should have TAGs or just be empty
         assert isinstance(result, str)
 
+    @pytest.mark.xdist_group("home_dir")
     def test_inject_preserves_original_prompt(self, temp_context_dir: Path):
         """Test that injection preserves original prompt."""
         injector = TagInjector()
@@ -107,6 +132,7 @@ class TestTagInjection:
         # Original prompt should be in result
         assert original in result or "Help me" in result
 
+    @pytest.mark.xdist_group("home_dir")
     def test_inject_adds_context_tags_section(self, temp_context_dir: Path):
         """Test that injection adds Context Tags section."""
         injector = TagInjector()
@@ -116,9 +142,9 @@ class TestTagInjection:
         if "## Context Tags" in result:
             assert "test prompt" in result
 
-    def test_custom_extractor(self, temp_context_dir: Path):
+    def test_custom_extractor(self, extracted_tags):
         """Test TAG injector with custom extractor."""
-        custom_extractor = TagExtractor(context_dir=temp_context_dir)
+        custom_extractor, _ = extracted_tags
         injector = TagInjector(extractor=custom_extractor)
         result = injector.inject("test")
 
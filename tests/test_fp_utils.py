@@ -401,6 +401,20 @@ class TestPipelines:
         assert isinstance(result, Failure)
         assert "Missing keys" in str(result.failure())
 
+    @pytest.mark.unit
+    def test_parse_and_validate_frozenset_keys(self, temp_config_file):
+        """Should accept a prebuilt frozenset and report missing keys sorted."""
+        with open(temp_config_file, 'w') as f:
+            f.write("gates: {}\n")
+
+        result = parse_and_validate_config(
+            temp_config_file,
+            required_keys=frozenset({"version", "gates", "alerts"})
+        )
+
+        assert isinstance(result, Failure)
+        assert "Missing keys: alerts, version" in str(result.failure())
+
 
 # =============================================================================
 # Safe Operations Tests
@@ -497,8 +511,8 @@ class TestResultDataclasses:
             exit_code=0
         )
 
-        # Attempting to modify should raise error
-        with pytest.raises(FrozenInstanceError):
+        # Attempting to modify should raise error (NamedTuple fields are read-only)
+        with pytest.raises(AttributeError):
             result.success = False
 
     @pytest.mark.unit
@@ -250,6 +250,7 @@ class TestKPILogger:
         events = logger.get_recent_events()
         assert len(events) >= 1  # At least the valid event
 
+    @pytest.mark.xdist_group("home_dir")
     def test_default_kpis_dir_location(self):
         """Test that default kpis dir is ~/.claude/kpis."""
         logger = KPILogger()  # No kpis_dir specified
@@ -14,6 +14,8 @@ import sys
 lib_dir = Path(__file__).parent.parent / "lib"
 sys.path.insert(0, str(lib_dir))
 
+from _fastio import fwrite
+
 
 # =============================================================================
 # Ruff Formatter Tests
@@ -52,6 +54,7 @@ class TestRuffFormatterBasic:
         assert "--target=py312" in formatter.config_args
 
 
+@pytest.mark.xdist_group("ruff-integration")
 class TestRuffFormatterReal:
     """Integration tests using real ruff executable."""
 
@@ -60,16 +63,13 @@ class TestRuffFormatterReal:
         sys.platform == "darwin",
         reason="Requires ruff installed (Unix-like)"
     )
-    def test_format_file_real(self, tmp_path):
+    def test_format_file_real(self, tmp_path, default_formatter):
         """Test actual file formatting with real ruff."""
         # Crear un archivo desordenado
         test_file = tmp_path / "test_format_real.py"
-        test_file.write_text("def foo():return    1+2+3+4+5+6+7+8+9+10+11+12+13", encoding='utf-8')
-
-        from ruff_formatter import RuffFormatter
-        formatter = RuffFormatter()
+        fwrite(test_file, "def foo():return    1+2+3+4+5+6+7+8+9+10+11+12+13")
 
-        result = formatter.format_file(test_file)
+        result = default_formatter.format_file(test_file)
 
         # Solo verificar que se ejecutó sin error
         assert result.exit_code in [0, 1]  # 0 = success, 1 = already formatted
@@ -80,12 +80,9 @@ class TestRuffFormatterReal:
         sys.platform == "darwin",
         reason="Requires ruff installed (Unix-like)"
     )
-    def test_is_available(self):
+    def test_is_available(self, default_formatter):
         """Test is_available with real ruff."""
-        from ruff_formatter import RuffFormatter
-
-        formatter = RuffFormatter()
-        result = formatter.is_available()
+        result = default_formatter.is_available()
 
         # Si ruff no está instalado, devuelve False
         # Si está instalado, devuelve True
@@ -105,10 +102,7 @@ class TestFPUtilsBasic:
         from fp_utils import load_config
 
         config_path = tmp_path / "test_config.yaml"
-        config_path.write_text(
-            "gates:\n  test:\n    command: echo 'test'\n",
-            encoding='utf-8'
-        )
+        fwrite(config_path, "gates:\n  test:\n    command: echo 'test'\n")
 
         result = load_config(config_path)
 
@@ -126,9 +120,9 @@ class TestFPUtilsBasic:
         project_path = tmp_path / "test_project"
         (project_path / "src").mkdir(parents=True, exist_ok=True)
         (project_path / "lib").mkdir(parents=True, exist_ok=True)
-        (project_path / "package.json").write_text('{"name": "test"}')
-        (project_path / "README.md").write_text("# Test Project")
-        (project_path / "pyproject.toml").write_text('[project]\\nname = "test"')
+        fwrite(project_path / "package.json", '{"name": "test"}')
+        fwrite(project_path / "README.md", "# Test Project")
+        fwrite(project_path / "pyproject.toml", '[project]\\nname = "test"')
 
         result = validate_project_structure(project_path)
 
@@ -146,7 +140,7 @@ class TestFPUtilsBasic:
         (project_path / "src").mkdir(parents=True, exist_ok=True)
 
         # Create main.py
-        (project_path / "src" / "main.py").write_text("print('hello')", encoding='utf-8')
+        fwrite(project_path / "src" / "main.py", "print('hello')")
 
         result = find_first_python_file(project_path / "src")
 
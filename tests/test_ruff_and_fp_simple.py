@@ -6,13 +6,15 @@ Tests verify the actual functionality works correctly.
 import pytest
 import tempfile
 from pathlib import Path
-import subprocess
+import shutil
 
 # Add lib directory to path
 lib_dir = Path(__file__).parent.parent / "lib"
 import sys
 sys.path.insert(0, str(lib_dir))
 
+from _fastio import fwrite
+
 from ruff_formatter import RuffFormatter, RuffResult
 from fp_utils import (
     load_config, validate_project_structure,
@@ -26,76 +28,69 @@ class TestRuffFormatterSimple:
     """Simple tests for Ruff formatter."""
 
     @pytest.mark.unit
-    def test_formatter_creates_instance(self):
+    def test_formatter_creates_instance(self, default_formatter):
         """RuffFormatter should create instance."""
-        formatter = RuffFormatter()
-        assert formatter is not None
-        assert hasattr(formatter, 'format_file')
+        assert default_formatter is not None
+        assert hasattr(default_formatter, 'format_file')
 
     @pytest.mark.unit
-    def test_is_available_returns_bool(self):
+    def test_is_available_returns_bool(self, default_formatter):
         """is_available should return boolean."""
-        formatter = RuffFormatter()
-        result = formatter.is_available()
+        result = default_formatter.is_available()
         
         # Should return bool
         assert isinstance(result, bool)
 
-    @pytest.mark.skipifnot(
-        subprocess.run(['which', 'ruff'], capture_output=True).returncode == 0,
-        reason="ruff not installed"
-    )
-    def test_format_creates_file(self, tmp_path):
+    @pytest.mark.xdist_group("ruff-integration")
+    @pytest.mark.skipif(shutil.which('ruff') is None, reason="ruff not installed")
+    def test_format_creates_file(self, tmp_path, default_formatter):
         """format_file should create file."""
-        formatter = RuffFormatter()
-        
         test_file = tmp_path / "test_format.py"
-        test_file.write_text("x=1\ny=2\n", encoding='utf-8')
+        fwrite(test_file, "x=1\ny=2\n")
         
-        result = formatter.format_file(test_file)
+        result = default_formatter.format_file(test_file)
         
         # Should complete
         assert result.success is True
         assert "1 file" in result.output.lower()
 
     @pytest.mark.unit
-    def test_check_returns_exit_code(self):
+    @pytest.mark.xdist_group("ruff-integration")
+    def test_check_returns_exit_code(self, tmp_path, default_formatter):
         """check_and_fix should return proper exit code."""
-        formatter = RuffFormatter()
-        
         test_file = tmp_path / "test_check.py"
-        test_file.write_text("def foo():return 1", encoding='utf-8')
+        fwrite(test_file, "def foo():return 1")
         
-        result = formatter.check_and_fix(test_file)
+        result = default_formatter.check_and_fix(test_file)
         
         # Should capture exit code
         assert result.exit_code in [0, 1]
 
     @pytest.mark.unit
-    def test_format_and_check_works(self, tmp_path):
+    @pytest.mark.xdist_group("ruff-integration")
+    def test_format_and_check_works(self, tmp_path, default_formatter):
         """format_and_check should work correctly."""
-        formatter = RuffFormatter()
-        
         test_file = tmp_path / "test_both.py"
-        test_file.write_text("def foo():return 1", encoding='utf-8')
+        fwrite(test_file, "def foo():return 1")
         
-        result = formatter.format_and_check(test_file)
+        result = default_formatter.format_and_check(test_file)
         
         # Should have both operations
         assert result.success is True
         assert result.formatted is True
 
     @pytest.mark.unit
-    def test_config_args_passed(self):
+    @pytest.mark.xdist_group("ruff-integration")
+    def test_config_args_passed(self, tmp_path):
         """Config args should be passed correctly."""
         config_path = tmp_path / "ruff.toml"
-        config_path.write_text("[line-length]\nmax-line-length = 100", encoding='utf-8')
+        fwrite(config_path, "[line-length]\nmax-line-length = 100")
         
         formatter = RuffFormatter(config_path=config_path)
         
         # Verify config args include config
         test_file = tmp_path / "test_config.py"
-        test_file.write_text("x=1", encoding='utf-8')
+        fwrite(test_file, "x=1")
         formatter.format_file(test_file)
         
         call_args = formatter.config_args
@@ -124,8 +119,8 @@ class TestFPUtilsSimple:
             project = Path(tmpdir)
             (project / "src").mkdir(parents=True, exist_ok=True)
             (project / "lib").mkdir(parents=True, exist_ok=True)
-            (project / "package.json").write_text('{"name": "test"}')
-            (project / "README.md").write_text("# Test")
+            fwrite(project / "package.json", '{"name": "test"}')
+            fwrite(project / "README.md", "# Test")
             
             result = validate_project_structure(project)
         
@@ -175,11 +170,11 @@ class TestFPUtilsSimple:
     def test_parse_and_validate_flow(self, tmp_path):
         """parse_and_validate_config should work."""
         config_path = tmp_path / "gates.yaml"
-        config_path.write_text("""
+        fwrite(config_path, """
 gates:
   check-gate:
     command: echo "test"
-""", encoding='utf-8')
+""")
         
         result = parse_and_validate_config(
             config_path,
@@ -16,11 +16,11 @@ import subprocess
 lib_dir = Path(__file__).parent.parent / "lib"
 sys.path.insert(0, str(lib_dir))
 
-from ruff_formatter import RuffFormatter, RuffResult
+from ruff_formatter import RuffFormatter, RuffResult, RuffFailureKind
 
 
 class TestRuffResult:
-    """Test RuffResult dataclass."""
+    """Test RuffResult record."""
 
     def test_ruff_result_is_frozen(self):
         """Test that RuffResult is frozen (immutable)."""
@@ -54,13 +54,14 @@ class TestRuffResult:
         assert result.lint_fixed == 3
         assert result.output == "Some output"
         assert result.exit_code == 1
+        assert result.failure_kind == RuffFailureKind.NONE
 
 
 class TestRuffFormatter:
     """Test RuffFormatter wrapper."""
 
     @patch('subprocess.run')
-    def test_format_file_success(self, mock_run):
+    def test_format_file_success(self, mock_run, default_formatter):
         """Test successful file formatting."""
         mock_run.return_value = Mock(
             returncode=0,
@@ -68,8 +69,7 @@ class TestRuffFormatter:
             stderr=""
         )
 
-        formatter = RuffFormatter()
-        result = formatter.format_file(Path("test.py"))
+        result = default_formatter.format_file(Path("test.py"))
 
         assert result.success is True
         assert result.formatted is True
@@ -77,7 +77,7 @@ class TestRuffFormatter:
         mock_run.assert_called_once()
 
     @patch('subprocess.run')
-    def test_format_file_no_changes_needed(self, mock_run):
+    def test_format_file_no_changes_needed(self, mock_run, default_formatter):
         """Test formatting when file is already correct."""
         mock_run.return_value = Mock(
             returncode=0,
@@ -85,15 +85,14 @@ class TestRuffFormatter:
             stderr=""
         )
 
-        formatter = RuffFormatter()
-        result = formatter.format_file(Path("test.py"))
+        result = default_formatter.format_file(Path("test.py"))
 
         assert result.success is True
         assert result.formatted is False  # No changes made
         mock_run.assert_called_once()
 
     @patch('subprocess.run')
-    def test_check_and_fix_with_errors(self, mock_run):
+    def test_check_and_fix_with_errors(self, mock_run, default_formatter):
         """Test check with auto-fix."""
         mock_run.return_value = Mock(
             returncode=1,
@@ -101,14 +100,13 @@ class TestRuffFormatter:
             stderr=""
         )
 
-        formatter = RuffFormatter()
-        result = formatter.check_and_fix(Path("test.py"))
+        result = default_formatter.check_and_fix(Path("test.py"))
 
         assert result.success is False
         assert result.lint_fixed > 0
 
     @patch('subprocess.run')
-    def test_check_and_fix_no_fix_flag(self, mock_run):
+    def test_check_and_fix_no_fix_flag(self, mock_run, default_formatter):
         """Test check without --fix flag."""
         mock_run.return_value = Mock(
             returncode=1,
@@ -116,15 +114,14 @@ class TestRuffFormatter:
             stderr=""
         )
 
-        formatter = RuffFormatter()
-        result = formatter.check_and_fix(Path("test.py"), fix=False)
+        result = default_formatter.check_and_fix(Path("test.py"), fix=False)
 
         # Should call ruff without --fix
         call_args = mock_run.call_args[0][0]
         assert "--fix" not in call_args
 
     @patch('subprocess.run')
-    def test_format_and_check_combined(self, mock_run):
+    def test_format_and_check_combined(self, mock_run, default_formatter):
         """Test combined format + check operation."""
         mock_run.return_value = Mock(
             returncode=0,
@@ -132,37 +129,34 @@ class TestRuffFormatter:
             stderr=""
         )
 
-        formatter = RuffFormatter()
-        result = formatter.format_and_check(Path("test.py"))
+        result = default_formatter.format_and_check(Path("test.py"))
 
         # Should call subprocess twice (format + check)
         assert mock_run.call_count == 2
         assert result.success is True
 
     @patch('subprocess.run')
-    def test_format_file_timeout(self, mock_run):
+    def test_format_file_timeout(self, mock_run, default_formatter):
         """Test timeout handling during format."""
         from subprocess import TimeoutExpired
 
         mock_run.side_effect = TimeoutExpired("ruff", 10)
 
-        formatter = RuffFormatter()
-        result = formatter.format_file(Path("test.py"))
+        result = default_formatter.format_file(Path("test.py"))
 
         assert result.success is False
-        assert "timed out" in result.output.lower()
+        assert result.failure_kind == RuffFailureKind.TIMEOUT
         assert result.exit_code == -1
 
     @patch('subprocess.run')
-    def test_ruff_not_found(self, mock_run):
+    def test_ruff_not_found(self, mock_run, default_formatter):
         """Test handling when ruff is not installed."""
         mock_run.side_effect = FileNotFoundError()
 
-        formatter = RuffFormatter()
-        result = formatter.format_file(Path("test.py"))
+        result = default_formatter.format_file(Path("test.py"))
 
         assert result.success is False
-        assert "not found" in result.output.lower()
+        assert result.failure_kind == RuffFailureKind.NOT_FOUND
         assert result.exit_code == -2
 
     @patch('subprocess.run')
@@ -183,7 +177,29 @@ class TestRuffFormatter:
         assert f"--config={config_path}" in " ".join(call_args)
 
     @patch('subprocess.run')
-    def test_check_directory_instead_of_file(self, mock_run):
+    def test_argv_prefixes_built_at_init(self, mock_run):
+        """Test that commands reuse the argv prefixes computed in __init__."""
+        mock_run.return_value = Mock(
+            returncode=0,
+            stdout="",
+            stderr=""
+        )
+
+        config_path = Path("/custom/ruff.toml")
+        formatter = RuffFormatter(config_path=config_path)
+
+        formatter.format_file(Path("test.py"))
+        assert mock_run.call_args[0][0] == (
+            "ruff", "format", f"--config={config_path}", "test.py"
+        )
+
+        formatter.check_and_fix(Path("test.py"))
+        assert mock_run.call_args[0][0] == (
+            "ruff", "check", "--fix", f"--config={config_path}", "test.py"
+        )
+
+    @patch('subprocess.run')
+    def test_check_directory_instead_of_file(self, mock_run, default_formatter):
         """Test check_and_fix with directory instead of file."""
         mock_run.return_value = Mock(
             returncode=0,
@@ -191,15 +207,14 @@ class TestRuffFormatter:
             stderr=""
         )
 
-        formatter = RuffFormatter()
-        result = formatter.check_and_fix()  # No file path
+        result = default_formatter.check_and_fix()  # No file path
 
         # Should check current directory
         call_args = mock_run.call_args[0][0]
         assert "." in call_args or str(Path.cwd()) in call_args
 
     @patch('subprocess.run')
-    def test_is_available_true(self, mock_run):
+    def test_is_available_true(self, mock_run, default_formatter):
         """Test is_available returns True when ruff exists."""
         mock_run.return_value = Mock(
             returncode=0,
@@ -207,16 +222,14 @@ class TestRuffFormatter:
             stderr=""
         )
 
-        formatter = RuffFormatter()
-        assert formatter.is_available() is True
+        assert default_formatter.is_available() is True
 
     @patch('subprocess.run')
-    def test_is_available_false(self, mock_run):
+    def test_is_available_false(self, mock_run, default_formatter):
         """Test is_available returns False when ruff missing."""
         mock_run.side_effect = FileNotFoundError()
 
-        formatter = RuffFormatter()
-        assert formatter.is_available() is False
+        assert default_formatter.is_available() is False
 
 
 @pytest.mark.unit
@@ -16,7 +16,9 @@ lib_dir = Path(__file__).parent.parent / "lib"
 sys.path.insert(0, str(lib_dir))
 
 from health import HealthChecker, HealthStatus
-from tag_system import TagInjector, TagExtractor, PromptTag
+from tag_system import (
+    TagInjector, TagExtractor, PromptTag, NearDupTracker, normalize, content_hash
+)
 from evidence_cli import EvidenceCLI, ValidationStatus
 from quality_gates import QualityGate, GateStatus
 from alerts import QualityAlerts, SeverityLevel
@@ -57,10 +59,26 @@ class TestTagSystem:
         assert "[K:identity]" in formatted
         assert "Test value" in formatted
 
+    def test_dataclass_fields_are_type_category_value(self):
+        from dataclasses import asdict, astuple
+        tag = PromptTag(type="K", category="identity", value="Test value")
+        assert tag.format() == "[K:identity] Test value"
+        assert asdict(tag) == {"type": "K", "category": "identity", "value": "Test value"}
+        assert astuple(tag) == ("K", "identity", "Test value")
+        assert repr(tag) == "PromptTag(type='K', category='identity', value='Test value')"
+
+    def test_tag_is_hashable_and_slotted(self):
+        tag = PromptTag(type="K", category="identity", value="Test value")
+        assert not hasattr(tag, "__dict__")
+        assert tag == PromptTag(type="K", category="identity", value="Test value")
+        assert len({tag, PromptTag(type="K", category="identity", value="Test value")}) == 1
+
+    @pytest.mark.xdist_group("home_dir")
     def test_tag_extractor_init(self):
         extractor = TagExtractor()
         assert extractor.context_dir == Path.home() / ".claude" / ".context"
 
+    @pytest.mark.xdist_group("home_dir")
     def test_tag_injector(self):
         injector = TagInjector()
         # Should return some version of prompt (with or without tags)
@@ -79,6 +97,121 @@ class TestTagSystem:
         assert "[U:rules]" in formatted
 
 
+class TestNormalizeAndHash:
+    """Test TAG text normalization used for deduplication."""
+
+    def test_normalize_collapses_whitespace(self):
+        assert normalize("a  b\t\tc\n\nd") == "a b c d"
+
+    def test_normalize_lowercase(self):
+        assert normalize("Felipe IS a Developer") == "felipe is a developer"
+
+    def test_normalize_strips(self):
+        assert normalize("  \n value \t ") == "value"
+
+    def test_normalize_empty(self):
+        assert normalize("") == ""
+        assert normalize(" \t\n ") == ""
+
+    def test_normalize_ascii_matches_unicode_path(self):
+        import re
+        samples = [
+            "Plain ASCII  Text\x0b\x0cwith\x1cseparators ",
+            "Café  NAÏVE\u00a0\u2003Straße\n",
+            "MiXeD ascii\tand ünïcödé  ",
+        ]
+        for sample in samples:
+            expected = re.sub(r'\s+', ' ', sample.lower()).strip()
+            assert normalize(sample) == expected
+
+    def test_same_content_same_hash(self):
+        assert content_hash("Felipe is a developer") == content_hash("Felipe is a developer")
+
+    def test_normalized_equivalent_same_hash(self):
+        assert content_hash("Felipe  IS a\tdeveloper ") == content_hash("felipe is a developer")
+
+    def test_different_content_different_hash(self):
+        assert content_hash("Felipe is a developer") != content_hash("Felipe is a nurse")
+
+    def test_hash_is_128_bit_hex(self):
+        digest = content_hash("value")
+        assert len(digest) == 32
+        int(digest, 16)
+
+    def test_hash_is_digest_of_normalized_text(self):
+        import hashlib
+        for sample in ["  Plain ASCII\tText ", "Café  NAÏVE\u00a0Straße"]:
+            expected = hashlib.blake2b(
+                normalize(sample).encode('utf-8'), digest_size=16
+            ).hexdigest()
+            assert content_hash(sample) == expected
+
+
+class TestNearDupTracker:
+    """Test near-duplicate detection for TAG values."""
+
+    def test_exact_duplicate(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup("Uses Python") is False
+        assert tracker.is_dup("uses  python") is True
+
+    def test_punctuation_only_difference(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup("Loves functional programming.") is False
+        assert tracker.is_dup("Loves functional-programming!") is True
+
+    def test_paraphrase_is_duplicate(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup(
+            "Prefers immutable data structures and pure functions in all Python code"
+        ) is False
+        assert tracker.is_dup(
+            "Prefers immutable data structures and pure functions in all Python code, always"
+        ) is True
+
+    def test_negation_is_kept(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup(
+            "Do not use mutable default arguments in any Python function definitions"
+        ) is False
+        assert tracker.is_dup(
+            "Do use mutable default arguments in any Python function definitions"
+        ) is False
+
+    def test_version_number_difference_is_kept(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup(
+            "Uses Python 3.11 for all backend services and internal tooling scripts"
+        ) is False
+        assert tracker.is_dup(
+            "Uses Python 3.12 for all backend services and internal tooling scripts"
+        ) is False
+
+    def test_distinct_values_kept(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup("Felipe is a Python developer") is False
+        assert tracker.is_dup("Felipe is a nurse") is False
+
+    def test_distinct_non_latin_values_kept(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup("Программист") is False
+        assert tracker.is_dup("Медсестра в больнице") is False
+        assert tracker.is_dup("プログラマー") is False
+        assert tracker.is_dup("Προγραμματιστής") is False
+        assert tracker.is_dup("программист") is True
+
+    def test_accented_words_stay_whole(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup("Escribe código limpio") is False
+        assert tracker.is_dup("Escribe c digo limpio") is False
+
+    def test_punctuation_only_values_use_exact_match(self):
+        tracker = NearDupTracker()
+        assert tracker.is_dup("---") is False
+        assert tracker.is_dup("...") is False
+        assert tracker.is_dup("---") is True
+
+
 class TestEvidenceCLI:
     """Test Evidence validation functionality."""
 
@@ -133,6 +266,19 @@ class TestQualityGates:
         assert result.status == GateStatus.PASSED
 
 
+@pytest.fixture(scope="session")
+def empty_alerts_config(tmp_path_factory) -> QualityAlerts:
+    """
+    QualityAlerts loaded from a config with no thresholds.
+
+    QualityAlerts holds no state beyond the parsed config, so the YAML is
+    written and parsed once per session instead of once per test.
+    """
+    config_path = tmp_path_factory.mktemp("cfg") / "alerts.yaml"
+    config_path.write_text("thresholds: {}")
+    return QualityAlerts(config_path)
+
+
 class TestAlerts:
     """Test quality alerts functionality."""
 
@@ -149,17 +295,13 @@ thresholds:
         alerts = QualityAlerts(config_path)
         assert alerts.thresholds['critical']['failure_rate'] == 0.5
 
-    def test_format_alerts_empty(self, tmp_path):
-        config_path = tmp_path / "alerts.yaml"
-        config_path.write_text("thresholds: {}")
-        alerts = QualityAlerts(config_path)
+    def test_format_alerts_empty(self, empty_alerts_config):
+        alerts = empty_alerts_config
         formatted = alerts.format_alerts([])
         assert "No quality alerts" in formatted
 
-    def test_format_alerts_with_content(self, tmp_path):
-        config_path = tmp_path / "alerts.yaml"
-        config_path.write_text("thresholds: {}")
-        alerts = QualityAlerts(config_path)
+    def test_format_alerts_with_content(self, empty_alerts_config):
+        alerts = empty_alerts_config
 
         from alerts import Alert
         test_alerts = [
@@ -175,11 +317,9 @@ thresholds:
         assert "HIGH" in formatted
         assert "Test alert" in formatted
 
-    def test_should_block_session(self, tmp_path):
+    def test_should_block_session(self, empty_alerts_config):
         from alerts import Alert
-        config_path = tmp_path / "alerts.yaml"
-        config_path.write_text("thresholds: {}")
-        alerts = QualityAlerts(config_path)
+        alerts = empty_alerts_config
 
         critical_alert = Alert(
             severity=SeverityLevel.CRITICAL,
@@ -194,12 +334,12 @@ thresholds:
 class TestHandoff:
     """Test handoff protocol functionality."""
 
-    def test_handoff_protocol_init(self):
-        protocol = HandoffProtocol()
+    def test_handoff_protocol_init(self, tmp_path):
+        protocol = HandoffProtocol(claude_dir=tmp_path)
         assert protocol.handoff_dir.exists()
 
-    def test_create_handoff(self):
-        protocol = HandoffProtocol()
+    def test_create_handoff(self, tmp_path):
+        protocol = HandoffProtocol(claude_dir=tmp_path)
         handoff = protocol.create_from_session({
             'session_id': 'test-session',
             'completed_tasks': ['Task 1', 'Task 2'],
@@ -242,8 +382,8 @@ class TestHandoff:
         json_path = path.with_suffix(path.suffix + '.json')
         assert json_path.exists()
 
-    def test_extract_tasks_numbered(self):
-        protocol = HandoffProtocol()
+    def test_extract_tasks_numbered(self, tmp_path):
+        protocol = HandoffProtocol(claude_dir=tmp_path)
         tasks = protocol._extract_tasks("1. First task\n2. Second task")
         assert len(tasks) == 2
         assert "First task" in tasks[0]
@@ -284,8 +424,8 @@ class TestHandoff:
 class TestBackup:
     """Test backup and rollback functionality."""
 
-    def test_backup_init(self):
-        backup = StateBackup()
+    def test_backup_init(self, tmp_path):
+        backup = StateBackup(backup_dir=tmp_path / "backups")
         assert backup.backup_dir.exists()
 
     def test_create_backup(self, tmp_path):
@@ -309,15 +449,38 @@ class TestBackup:
         backup = StateBackup(backup_dir=tmp_path / "backups")
 
         # Create multiple backups
+        groups = []
         for i in range(5):
             test_file = tmp_path / f"test{i}.txt"
             test_file.write_text(f"content {i}")
-            backup.create_backup([test_file])
+            groups.append([test_file])
+        backup.create_backups_batch(groups, ["manual"] * len(groups))
 
         # Keep only 2
         removed = backup.cleanup_old_backups(keep=2)
         assert removed >= 0
 
+    def test_create_backups_batch(self, tmp_path):
+        first = tmp_path / "first.txt"
+        first.write_text("first")
+        second = tmp_path / "second.txt"
+        second.write_text("second")
+
+        backup = StateBackup(backup_dir=tmp_path / "backups")
+        batch = backup.create_backups_batch(
+            [[first], [second, tmp_path / "missing.txt"]], ["a", "b"]
+        )
+
+        assert [m.reason for m in batch] == ["a", "b"]
+        assert batch[1].files_backed_up == [str(second)]
+        assert len({m.backup_id for m in batch}) == 2
+        assert {m.backup_id for m in backup.list_backups()} == {m.backup_id for m in batch}
+
+    def test_create_backups_batch_length_mismatch(self, tmp_path):
+        backup = StateBackup(backup_dir=tmp_path / "backups")
+        with pytest.raises(ValueError):
+            backup.create_backups_batch([[tmp_path / "a.txt"]], [])
+
     def test_restore_nonexistent_backup(self, tmp_path):
         """Test restore of nonexistent backup returns False."""
         backup = StateBackup(backup_dir=tmp_path / "backups")
@@ -409,11 +572,9 @@ class TestQualityGatesTimeout:
 class TestAlertsEdgeCases:
     """Test alerts edge cases."""
 
-    def test_alert_no_thresholds_met(self, tmp_path):
+    def test_alert_no_thresholds_met(self, empty_alerts_config):
         """Test when no thresholds are triggered."""
-        config_path = tmp_path / "alerts.yaml"
-        config_path.write_text("thresholds: {}")
-        alerts = QualityAlerts(config_path)
+        alerts = empty_alerts_config
 
         # All gates passed - should trigger no alerts
         from quality_gates import GateExecutionResult
@@ -429,11 +590,9 @@ class TestAlertsEdgeCases:
 
         assert len(alert_list) == 0
 
-    def test_alert_with_empty_results(self, tmp_path):
+    def test_alert_with_empty_results(self, empty_alerts_config):
         """Test alerts with empty results list."""
-        config_path = tmp_path / "alerts.yaml"
-        config_path.write_text("thresholds: {}")
-        alerts = QualityAlerts(config_path)
+        alerts = empty_alerts_config
 
         alert_list = alerts.evaluate_gate_results([])
         assert isinstance(alert_list, list)
@@ -4,63 +4,78 @@ Unit Tests for Utils Module
 Tests the shared utility functions.
 """
 
-import pytest
+import os
+import sys
 import time
-from pathlib import Path
+from unittest.mock import patch
 
-# Add lib to path for imports
-import sys
-lib_dir = Path(__file__).parent.parent / "lib"
-sys.path.insert(0, str(lib_dir))
+import pytest
+from pathlib import Path
 
-from utils import measure_duration_ms
+from utils import measure_duration_ms, get_recent_files
+from _fastio import touch_many
 
 
 class TestMeasureDurationMs:
     """Test measure_duration_ms function."""
 
-    def test_measure_duration_fast_function(self):
-        """Test measuring fast function duration."""
-        def fast_function() -> str:
-            return "quick result"
+    def test_measure_duration_fast_function(self, monkeypatch):
+        """Test sub-millisecond durations keep their fraction."""
+        # Fake clock: 50us elapse between the start and end reads
+        monkeypatch.setattr("utils.perf_counter_ns", iter([0, 50_000]).__next__)
+        monkeypatch.setattr("utils._CLOCK_OVERHEAD_NS", 0)
 
-        result, duration = measure_duration_ms(fast_function)
+        result, duration = measure_duration_ms(lambda: "quick result")
 
         assert result == "quick result"
-        assert duration >= 0
-        assert duration < 100  # Should be very fast
+        assert duration == 0.05
 
-    def test_measure_duration_slow_function(self):
+    def test_measure_duration_slow_function(self, monkeypatch):
         """Test measuring slow function duration."""
-        def slow_function() -> str:
-            time.sleep(0.1)  # 100ms
-            return "slow result"
+        # Fake clock: 100ms elapse between the start and end reads
+        monkeypatch.setattr("utils.perf_counter_ns", iter([0, 100_000_000]).__next__)
+        monkeypatch.setattr("utils._CLOCK_OVERHEAD_NS", 0)
 
-        result, duration = measure_duration_ms(slow_function)
+        result, duration = measure_duration_ms(lambda: "slow result")
 
         assert result == "slow result"
-        assert duration >= 90  # At least 90ms
-        assert duration < 200  # But not too long
-
-    def test_measure_duration_none_return(self):
-        """Test measuring function that returns None."""
-        def none_function() -> None:
-            return None
+        assert duration == 100.0
+
+    @pytest.mark.parametrize(
+        "func,expected",
+        [
+            (lambda: None, None),
+            (lambda: 42, 42),
+            (lambda: [1, 2, 3, 4, 5], [1, 2, 3, 4, 5]),
+            (lambda: {"a": 1, "b": 2}, {"a": 1, "b": 2}),
+            (lambda: 1 + 1, 2),
+            (lambda: 5 * 5, 25),
+        ],
+        ids=["none", "int", "list", "dict", "instant", "lambda"],
+    )
+    def test_measure_duration_passthrough(self, func, expected):
+        """Test result passthrough and non-negative duration for any return type."""
+        result, duration = measure_duration_ms(func)
+
+        assert result == expected
+        assert duration >= 0
 
-        result, duration = measure_duration_ms(none_function)
+    def test_measure_duration_overhead_subtracted(self):
+        """Test clock overhead is removed so empty work measures below real work."""
+        _, empty = measure_duration_ms(lambda: None)
+        _, busy = measure_duration_ms(lambda: [i * i for i in range(1000)])
 
-        assert result is None
-        assert duration >= 0
+        assert 0 <= empty < busy
 
-    def test_measure_duration_int_return(self):
-        """Test measuring function that returns int."""
-        def int_function() -> int:
-            return 42
+    def test_measure_duration_never_negative(self, monkeypatch):
+        """Test elapsed time below the calibrated overhead clamps to zero."""
+        ticks = [0, 1]
+        monkeypatch.setattr("utils.perf_counter_ns", lambda: ticks.pop(0))
+        monkeypatch.setattr("utils._CLOCK_OVERHEAD_NS", 50)
 
-        result, duration = measure_duration_ms(int_function)
+        _, duration = measure_duration_ms(lambda: None)
 
-        assert result == 42
-        assert duration >= 0
+        assert duration == 0
 
     def test_measure_duration_with_exception(self):
         """Test measuring function that raises exception."""
@@ -70,36 +85,6 @@ class TestMeasureDurationMs:
         with pytest.raises(ValueError, match="Test error"):
             measure_duration_ms(raising_function)
 
-    def test_measure_duration_empty_function(self):
-        """Test measuring empty function."""
-        def empty_function() -> None:
-            pass
-
-        result, duration = measure_duration_ms(empty_function)
-
-        assert result is None
-        assert duration >= 0
-
-    def test_measure_duration_list_return(self):
-        """Test measuring function that returns list."""
-        def list_function() -> list[int]:
-            return [1, 2, 3, 4, 5]
-
-        result, duration = measure_duration_ms(list_function)
-
-        assert result == [1, 2, 3, 4, 5]
-        assert duration >= 0
-
-    def test_measure_duration_dict_return(self):
-        """Test measuring function that returns dict."""
-        def dict_function() -> dict[str, int]:
-            return {"a": 1, "b": 2}
-
-        result, duration = measure_duration_ms(dict_function)
-
-        assert result == {"a": 1, "b": 2}
-        assert duration >= 0
-
     def test_measure_duration_multiple_calls(self):
         """Test multiple consecutive measurements."""
         results = []
@@ -111,23 +96,189 @@ class TestMeasureDurationMs:
         assert [r[0] for r in results] == [0, 1, 2, 3, 4]
         assert all(d >= 0 for _, d in results)
 
-    def test_measure_duration_very_fast_function(self):
-        """Test measuring function that's practically instant."""
-        def instant_function() -> int:
-            return 1 + 1
 
-        result, duration = measure_duration_ms(instant_function)
+def _age(path: Path, seconds: float) -> None:
+    """Set a file's mtime to `seconds` in the past."""
+    t = time.time() - seconds
+    os.utime(path, (t, t))
 
-        assert result == 2
-        # Should be very fast, but measurable
-        assert duration >= 0
 
-    def test_measure_duration_lambda(self):
-        """Test measuring lambda function."""
-        result, duration = measure_duration_ms(lambda: 5 * 5)
+class TestGetRecentFiles:
+    """Test get_recent_files function."""
 
-        assert result == 25
-        assert duration >= 0
+    def test_returns_relative_paths(self, tmp_path):
+        """Test results are relative to the search root."""
+        (tmp_path / "subdir").mkdir()
+        (tmp_path / "top.py").write_text("")
+        (tmp_path / "subdir" / "nested.py").write_text("")
+
+        files = get_recent_files(tmp_path)
+
+        assert sorted(files) == ["subdir/nested.py", "top.py"]
+
+    def test_filters_by_extension(self, tmp_path):
+        """Test only files with the requested suffixes are returned."""
+        (tmp_path / "keep.py").write_text("")
+        (tmp_path / "skip.txt").write_text("")
+        (tmp_path / "data.json").write_text("")
+
+        assert get_recent_files(tmp_path) == ["keep.py"]
+        assert get_recent_files(tmp_path, extensions=[".json"]) == ["data.json"]
+
+    def test_extension_matches_splitext(self, tmp_path):
+        """Test suffix matching follows os.path.splitext for dotfiles and bare names."""
+        for name in [".py", "..py", "py", "archive.tar.py", "Makefile"]:
+            (tmp_path / name).write_text("")
+
+        assert get_recent_files(tmp_path) == ["archive.tar.py"]
+
+    def test_excludes_old_files(self, tmp_path):
+        """Test files older than the window are skipped."""
+        (tmp_path / "new.py").write_text("")
+        old = tmp_path / "old.py"
+        old.write_text("")
+        _age(old, 2 * 3600)
+
+        assert get_recent_files(tmp_path) == ["new.py"]
+
+    def test_hours_parameter(self, tmp_path):
+        """Test a wider window includes older files."""
+        old = tmp_path / "old.py"
+        old.write_text("")
+        _age(old, 2 * 3600)
+
+        assert get_recent_files(tmp_path, hours=1) == []
+        assert get_recent_files(tmp_path, hours=3) == ["old.py"]
+
+    def test_max_files_limit(self, tmp_path):
+        """Test max_files keeps the most recently modified files, newest first."""
+        names = [f"file{i}.py" for i in range(10)]
+        touch_many(str(tmp_path), names)
+        for i, name in enumerate(names):
+            _age(tmp_path / name, 100 - i)
+
+        files = get_recent_files(tmp_path, max_files=5)
+
+        assert files == [f"file{i}.py" for i in range(9, 4, -1)]
+
+    def test_max_files_none_unlimited(self, tmp_path):
+        """Test max_files=None returns every recent file."""
+        touch_many(str(tmp_path), [f"file{i}.py" for i in range(15)])
+
+        assert len(get_recent_files(tmp_path, max_files=None)) == 15
+
+    def test_excludes_configured_directories(self, tmp_path):
+        """Test files under default or custom excluded directories are skipped."""
+        for name in ["__pycache__", "node_modules", "generated", "src"]:
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "mod.py").write_text("")
+
+        assert sorted(get_recent_files(tmp_path)) == ["generated/mod.py", "src/mod.py"]
+        assert get_recent_files(tmp_path, exclude_dirs=["generated", "src", "__pycache__"]) == [
+            "node_modules/mod.py"
+        ]
+
+    def test_build_and_dist_sources_are_reported(self, tmp_path):
+        """Test source directories named build or dist are not excluded by default."""
+        for name in ["build", "dist"]:
+            (tmp_path / "pkg" / name).mkdir(parents=True)
+            (tmp_path / "pkg" / name / "mod.py").write_text("")
+
+        assert sorted(get_recent_files(tmp_path)) == ["pkg/build/mod.py", "pkg/dist/mod.py"]
+
+    def test_excludes_dir_never_scanned(self, tmp_path):
+        """Test excluded directories are pruned before they are listed."""
+        excluded = tmp_path / "node_modules" / "pkg"
+        excluded.mkdir(parents=True)
+        (excluded / "index.js").write_text("")
+        (tmp_path / "app.js").write_text("")
+
+        with patch("utils.os.scandir", wraps=os.scandir) as scandir:
+            files = get_recent_files(tmp_path)
+
+        assert files == ["app.js"]
+        scanned = [call.args[0] for call in scandir.call_args_list]
+        assert not any("node_modules" in str(path) for path in scanned)
+
+    def test_parallel_walk_matches_serial(self, tmp_path):
+        """Test the thread-pool walk finds the same files as the serial walk."""
+        for i in range(12):
+            nested = tmp_path / f"pkg{i}" / "sub"
+            nested.mkdir(parents=True)
+            (nested / f"mod{i}.py").write_text("")
+            (tmp_path / f"pkg{i}" / "README.md").write_text("")
+
+        serial = get_recent_files(tmp_path, parallel=False)
+        parallel = get_recent_files(tmp_path, parallel=True)
+
+        assert len(serial) == 24
+        assert sorted(parallel) == sorted(serial)
+
+    def test_serial_walk_is_default(self, tmp_path):
+        """Test the thread-pool walk is only used when asked for."""
+        for i in range(12):
+            (tmp_path / f"pkg{i}").mkdir()
+            (tmp_path / f"pkg{i}" / "mod.py").write_text("")
+
+        with patch("utils._walk_files_parallel") as parallel_walk:
+            files = get_recent_files(tmp_path)
+
+        parallel_walk.assert_not_called()
+        assert len(files) == 12
+
+    def test_serial_env_var_disables_parallel_walk(self, tmp_path, monkeypatch):
+        """Test FABRIK_WALK_SERIAL=1 overrides parallel=True."""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("")
+        monkeypatch.setenv("FABRIK_WALK_SERIAL", "1")
+
+        with patch("utils._walk_files_parallel") as parallel_walk:
+            files = get_recent_files(tmp_path, parallel=True)
+
+        parallel_walk.assert_not_called()
+        assert files == ["pkg/mod.py"]
+
+    def test_inode_order_returns_same_files(self, tmp_path, monkeypatch):
+        """Test order='inode' changes only stat order, not the result."""
+        monkeypatch.setattr("utils._inode_order_supported", lambda path: True)
+        names = [f"file{i}.py" for i in range(10)]
+        touch_many(str(tmp_path), names)
+        for i, name in enumerate(names):
+            _age(tmp_path / name, 100 - i)
+
+        assert get_recent_files(tmp_path, order='inode') == get_recent_files(tmp_path)
+
+    def test_invalid_order_rejected(self, tmp_path):
+        """Test unknown order values raise ValueError."""
+        with pytest.raises(ValueError, match="order"):
+            get_recent_files(tmp_path, order='size')
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/self/mounts")
+    def test_mount_fs_type_virtual_filesystem(self):
+        """Test /proc is recognised as a filesystem inode ordering skips."""
+        from utils import _mount_fs_type, _INODE_ORDER_FSTYPES
+
+        assert _mount_fs_type("/proc") == "proc"
+        assert "proc" not in _INODE_ORDER_FSTYPES
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inode order is Linux-only")
+    def test_fs_type_looked_up_once_per_device(self, tmp_path, monkeypatch):
+        """Test the mount table is read once per device, not once per call."""
+        import utils
+
+        monkeypatch.setattr(utils, "_DEV_FSTYPE_CACHE", {})
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+
+        with patch("utils._mount_fs_type", return_value="ext4") as lookup:
+            assert utils._inode_order_supported(str(tmp_path / "a"))
+            assert utils._inode_order_supported(str(tmp_path / "b"))
+
+        lookup.assert_called_once()
+
+    def test_missing_root_returns_empty(self, tmp_path):
+        """Test a nonexistent root yields no files instead of raising."""
+        assert get_recent_files(tmp_path / "missing") == []
 
 
 if __name__ == "__main__":